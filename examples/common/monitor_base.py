@@ -0,0 +1,164 @@
+"""
+Queue Monitor - Shared monitor plumbing
+
+Everything here is backend-agnostic: alert formatting, webhook delivery
+with coalescing and rate limiting, the cached per-tick timestamp, and
+the keyspace-notification wait loop. The RQ and Celery examples
+subclass BaseQueueMonitor and add only the Redis layout specific to
+their queue backend.
+"""
+
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Optional
+
+import requests
+
+# orjson serializes straight to bytes several times faster than the
+# stdlib; it is optional, and plain json is a perfectly good fallback.
+try:
+    import orjson
+
+    def _dumps(obj) -> bytes:
+        return orjson.dumps(obj)
+except ImportError:
+    import json
+
+    def _dumps(obj) -> bytes:
+        return json.dumps(obj).encode()
+
+# Alert templates, built once at import instead of re-assembled from
+# f-string pieces on every alert. Filled via str.format_map with the
+# status dict, so extra status keys are simply ignored.
+DEPTH_ALERT = "🚨 Queue '{queue}' depth: {depth} (threshold: {threshold})"
+FAILED_ALERT = "⚠️ Queue '{queue}' has {failed_count} failed jobs"
+WORKERS_ALERT = "🔴 Queue '{queue}' has no active workers!"
+
+
+class BaseQueueMonitor:
+    """
+    Common alerting machinery for the queue monitor examples.
+
+    Subclasses own the Redis connection and the check_* methods; this
+    class owns how alerts are throttled, batched, and delivered.
+    """
+
+    # Hash holding incrementally-maintained counts (see the subclasses'
+    # adjust_worker_count methods)
+    COUNTS_KEY = "qmon:counts"
+
+    # Pub/sub message type produced by the subclass's subscription
+    # ("pmessage" for pattern subscriptions, "message" for plain ones)
+    PUBSUB_MESSAGE_TYPE = "message"
+
+    def __init__(
+        self,
+        alert_webhook: Optional[str] = None,
+        queue_depth_threshold: int = 1000,
+        check_interval: int = 60,
+    ):
+        self.alert_webhook = alert_webhook or os.getenv("QUEUE_MONITOR_WEBHOOK")
+        self.queue_depth_threshold = queue_depth_threshold
+        self.check_interval = check_interval
+        self.last_alert = {}  # Monotonic timestamp of last alert per queue
+        # A pooled session keeps the webhook connection alive between
+        # alerts; the single-worker executor keeps a slow webhook
+        # endpoint from stalling the monitor loop.
+        self._http = requests.Session()
+        self._alert_pool = ThreadPoolExecutor(max_workers=1)
+        self._pending_alerts = []  # Alerts buffered until flush_alerts()
+        self._now_iso = None  # Timestamp string shared by one tick's statuses
+
+    def _timestamp(self) -> str:
+        """ISO timestamp for status dicts.
+
+        The monitor loop formats it once per tick; every check in that
+        tick reuses the string instead of re-running strftime formatting.
+        """
+        if self._now_iso is not None:
+            return self._now_iso
+        return datetime.utcnow().isoformat()
+
+    def _should_alert(self, key: str, window: float) -> bool:
+        """Rate-limit repeat alerts for the same condition.
+
+        Returns True (and records the time) if no alert for `key` went
+        out within the last `window` seconds.
+        """
+        now = time.monotonic()
+        last_alert_time = self.last_alert.get(key)
+        if last_alert_time is None or now - last_alert_time > window:
+            self.last_alert[key] = now
+            return True
+        return False
+
+    def send_alert(self, status: dict) -> None:
+        """Queue an alert; flush_alerts() delivers the batch."""
+        message = self.format_alert(status)
+        print(f"[ALERT] {message}")
+        self._pending_alerts.append(message)
+
+    def flush_alerts(self) -> None:
+        """Coalesce buffered alerts into a single webhook POST.
+
+        Several queues crossing thresholds in the same tick produce one
+        notification instead of a burst of webhook calls (and one Slack
+        ping instead of five).
+        """
+        if not self._pending_alerts:
+            return
+
+        message = "\n".join(self._pending_alerts)
+        self._pending_alerts = []
+
+        if self.alert_webhook:
+            self._alert_pool.submit(self._post_alert, message)
+
+    def _post_alert(self, message: str) -> None:
+        """Deliver an alert to the webhook off the monitor thread."""
+        try:
+            self._http.post(
+                self.alert_webhook,
+                data=_dumps({"text": message}),
+                headers={"Content-Type": "application/json"},
+                timeout=5,
+            )
+        except requests.RequestException as e:
+            print(f"[ERROR] Failed to send alert: {e}")
+
+    def format_alert(self, status: dict) -> str:
+        """Format alert message."""
+        if "depth" in status:
+            return DEPTH_ALERT.format_map(status)
+        elif "failed_count" in status:
+            return FAILED_ALERT.format_map(status)
+        elif "workers" in status:
+            return WORKERS_ALERT.format_map(status)
+        return str(status)
+
+    def _queue_from_channel(self, channel: bytes) -> str:
+        """Extract the queue name from a keyspace-notification channel."""
+        raise NotImplementedError
+
+    def _wait_for_activity(self, pubsub) -> None:
+        """Block on queue activity, capped at check_interval.
+
+        The cap keeps worker-liveness ticks running; only a burst of
+        events big enough to plausibly cross the depth threshold cuts
+        the wait short.
+        """
+        events = {}
+        deadline = time.monotonic() + self.check_interval
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return
+            message = pubsub.get_message(timeout=remaining)
+            if not message or message.get("type") != self.PUBSUB_MESSAGE_TYPE:
+                continue
+            queue_name = self._queue_from_channel(message["channel"])
+            events[queue_name] = events.get(queue_name, 0) + 1
+            if events[queue_name] >= self.queue_depth_threshold:
+                return
@@ -0,0 +1,156 @@
+"""
+Queue Monitor - Sharded RQ Integration Example (asyncio)
+
+This example shows how to monitor RQ queues spread across several Redis
+shards. The async client lets one process check every shard
+concurrently, so a tick takes as long as the slowest shard instead of
+the sum of all of them.
+
+Installation:
+    pip install rq "redis[hiredis]"
+
+Usage:
+    REDIS_SHARDS="redis://shard1:6379,redis://shard2:6379" python monitor_sharded.py
+
+See monitor.py for the single-shard synchronous version.
+"""
+
+import asyncio
+import os
+import sys
+import time
+from typing import Optional
+
+import redis.asyncio as redis
+import requests
+
+
+class ShardedQueueMonitor:
+    """
+    Monitor RQ queues across multiple Redis shards concurrently.
+
+    Each shard is checked with the same server-side Lua script as the
+    single-shard monitor; asyncio.gather overlaps the round-trips so
+    adding shards does not add latency.
+    """
+
+    # Server-side check: KEYS alternates queue key / failed-set key.
+    # Returns (key, depth, failed) rows only for queues with something
+    # to report (see monitor.py for details).
+    CHECK_SCRIPT = (
+        "local r={} "
+        "for i=1,#KEYS,2 do "
+        "local n=redis.call('LLEN',KEYS[i]) "
+        "local f=redis.call('SCARD',KEYS[i+1]) "
+        "if n>=tonumber(ARGV[1]) or f>0 then r[#r+1]={KEYS[i],n,f} end "
+        "end "
+        "return r"
+    )
+
+    def __init__(
+        self,
+        shard_urls: list[str],
+        alert_webhook: Optional[str] = None,
+        queue_depth_threshold: int = 1000,
+        check_interval: int = 60,
+    ):
+        self.shards = [
+            redis.from_url(url, socket_keepalive=True, health_check_interval=30)
+            for url in shard_urls
+        ]
+        self.shard_urls = shard_urls
+        self.alert_webhook = alert_webhook or os.getenv("QUEUE_MONITOR_WEBHOOK")
+        self.queue_depth_threshold = queue_depth_threshold
+        self.check_interval = check_interval
+        self.last_alert = {}  # Monotonic timestamp of last alert per queue
+        self._shas = [None] * len(self.shards)  # Per-shard script SHAs
+        self._http = requests.Session()
+
+    async def _check_shard(self, index: int, queue_names: list[str]) -> list:
+        """Run the Lua check on one shard, returning unhealthy queues."""
+        shard = self.shards[index]
+        if self._shas[index] is None:
+            self._shas[index] = await shard.script_load(self.CHECK_SCRIPT)
+
+        keys = []
+        for queue_name in queue_names:
+            keys.append(f"rq:queue:{queue_name}")
+            keys.append(f"rq:queue:{queue_name}:failed")
+        rows = await shard.evalsha(
+            self._shas[index], len(keys), *keys, self.queue_depth_threshold
+        )
+        prefix = len("rq:queue:")
+        return [
+            (key.decode()[prefix:], int(depth), int(failed))
+            for key, depth, failed in rows
+        ]
+
+    async def check_all(self, queue_names: list[str]) -> None:
+        """Check every shard concurrently and alert on unhealthy queues."""
+        results = await asyncio.gather(
+            *(self._check_shard(i, queue_names) for i in range(len(self.shards))),
+            return_exceptions=True,
+        )
+
+        messages = []
+        for index, rows in enumerate(results):
+            if isinstance(rows, Exception):
+                print(f"[ERROR] Shard {self.shard_urls[index]}: {rows}")
+                continue
+            for queue_name, depth, failed_count in rows:
+                if depth >= self.queue_depth_threshold:
+                    messages.append(
+                        f"🚨 Queue '{queue_name}' on shard {index} depth: {depth} "
+                        f"(threshold: {self.queue_depth_threshold})"
+                    )
+                if failed_count > 0:
+                    messages.append(
+                        f"⚠️ Queue '{queue_name}' on shard {index} has "
+                        f"{failed_count} failed jobs"
+                    )
+
+        for message in messages:
+            print(f"[ALERT] {message}")
+
+        # One coalesced POST per tick; rate-limited like monitor.py
+        now = time.monotonic()
+        if messages and self.alert_webhook:
+            if now - self.last_alert.get("webhook", 0) > 15 * 60:
+                self.last_alert["webhook"] = now
+                await asyncio.to_thread(self._post_alert, "\n".join(messages))
+
+    def _post_alert(self, message: str) -> None:
+        """Deliver an alert to the webhook off the event loop."""
+        try:
+            self._http.post(self.alert_webhook, json={"text": message}, timeout=5)
+        except requests.RequestException as e:
+            print(f"[ERROR] Failed to send alert: {e}")
+
+    async def monitor(self, queue_names: list[str]) -> None:
+        """Continuously monitor queues on every shard."""
+        print(f"Monitoring queues: {', '.join(queue_names)}")
+        print(f"Shards: {len(self.shards)}")
+        print(f"Depth threshold: {self.queue_depth_threshold}")
+        print(f"Check interval: {self.check_interval}s")
+        print("-" * 50)
+
+        while True:
+            await self.check_all(queue_names)
+            await asyncio.sleep(self.check_interval)
+
+
+# Example usage
+if __name__ == "__main__":
+    queues = sys.argv[1:] if len(sys.argv) > 1 else ["default", "high", "low"]
+    shards = os.getenv("REDIS_SHARDS", "redis://localhost:6379").split(",")
+
+    monitor = ShardedQueueMonitor(
+        shard_urls=[url.strip() for url in shards],
+        queue_depth_threshold=500,
+        check_interval=60,
+    )
+
+    try:
+        asyncio.run(monitor.monitor(queues))
+    except KeyboardInterrupt:
+        print("\nMonitoring stopped.")